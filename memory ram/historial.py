@@ -0,0 +1,263 @@
+"""
+Exportación y análisis del historial de procesos completados.
+
+ExportadorHistorial escribe un registro por proceso terminado, por bloques, en CSV
+y en un directorio columnar: un archivo binario int64 por columna más esquema.json
+con el número de filas. HistorialColumnar abre ese directorio con memoria mapeada
+y calcula agregados bloque a bloque, por lo que sirve para historiales más grandes
+que la RAM.
+
+Uso:
+    python historial.py historial_procesos     # resumen de un historial exportado
+"""
+import argparse
+import csv
+import json
+import os
+from array import array
+
+import numpy as np
+
+# Columnas exportadas; los tiempos desconocidos (estados guardados antiguos) se escriben como -1
+COLUMNAS = ("id", "tamano", "tiempo_ejecucion", "tiempo_llegada", "tiempo_asignacion",
+            "tiempo_inicio", "tiempo_fin", "particion_id", "fragmentacion_interna")
+TIPO = "int64"
+ESQUEMA = "esquema.json"
+
+# Filas acumuladas en memoria antes de escribir un bloque
+TAM_BLOQUE = 65536
+
+
+def _valor(dato):
+    return -1 if dato is None else dato
+
+
+class ExportadorHistorial:
+    def __init__(self, ruta_columnar=None, ruta_csv=None, tam_bloque=TAM_BLOQUE):
+        if ruta_columnar is None and ruta_csv is None:
+            raise ValueError("Se necesita una ruta columnar o CSV para exportar")
+        
+        self.ruta_columnar = ruta_columnar
+        self.tam_bloque = tam_bloque
+        self.filas = 0
+        self.bloque = [array('q') for _ in COLUMNAS]  # Un arreglo por columna, en el orden de COLUMNAS
+        self.pendientes = 0
+        
+        self.archivos = {}
+        if ruta_columnar is not None:
+            os.makedirs(ruta_columnar, exist_ok=True)
+            for nombre in COLUMNAS:
+                self.archivos[nombre] = open(os.path.join(ruta_columnar, f"{nombre}.bin"), 'wb')
+            self.escribir_esquema()
+        
+        self.archivo_csv = None
+        self.escritor_csv = None
+        if ruta_csv is not None:
+            self.archivo_csv = open(ruta_csv, 'w', newline='')
+            self.escritor_csv = csv.writer(self.archivo_csv)
+            self.escritor_csv.writerow(COLUMNAS)
+    
+    def agregar(self, proceso):
+        registro = (proceso.id, proceso.tamano, proceso.tiempo_ejecucion,
+                    _valor(proceso.tiempo_llegada), _valor(proceso.tiempo_asignacion),
+                    _valor(proceso.tiempo_inicio), _valor(proceso.tiempo_fin),
+                    _valor(proceso.particion_id), _valor(proceso.fragmentacion_interna))
+        for columna, dato in zip(self.bloque, registro):
+            columna.append(dato)
+        self.pendientes += 1
+        
+        if self.pendientes >= self.tam_bloque:
+            self.vaciar()
+    
+    def agregar_varios(self, procesos):
+        for proceso in procesos:
+            self.agregar(proceso)
+    
+    def vaciar(self):
+        if self.pendientes == 0:
+            return
+        
+        for nombre, columna in zip(COLUMNAS, self.bloque):
+            if nombre in self.archivos:
+                columna.tofile(self.archivos[nombre])
+                self.archivos[nombre].flush()
+        
+        if self.escritor_csv is not None:
+            self.escritor_csv.writerows(zip(*self.bloque))
+            self.archivo_csv.flush()
+        
+        self.filas += self.pendientes
+        self.bloque = [array('q') for _ in COLUMNAS]
+        self.pendientes = 0
+        
+        # El esquema se reescribe en cada bloque para que el historial parcial sea legible
+        if self.ruta_columnar is not None:
+            self.escribir_esquema()
+    
+    def escribir_esquema(self):
+        with open(os.path.join(self.ruta_columnar, ESQUEMA), 'w') as f:
+            json.dump({"columnas": list(COLUMNAS), "tipo": TIPO, "filas": self.filas}, f, indent=2)
+    
+    def cerrar(self):
+        self.vaciar()
+        for archivo in self.archivos.values():
+            archivo.close()
+        self.archivos = {}
+        if self.archivo_csv is not None:
+            self.archivo_csv.close()
+            self.archivo_csv = None
+            self.escritor_csv = None
+
+
+def exportar_historial(procesos, ruta_columnar=None, ruta_csv=None, tam_bloque=TAM_BLOQUE):
+    exportador = ExportadorHistorial(ruta_columnar, ruta_csv, tam_bloque)
+    try:
+        exportador.agregar_varios(procesos)
+    finally:
+        exportador.cerrar()
+    return exportador.filas
+
+
+class HistorialColumnar:
+    METRICAS = ("espera", "retorno", "respuesta")
+    
+    def __init__(self, ruta):
+        with open(os.path.join(ruta, ESQUEMA), 'r') as f:
+            esquema = json.load(f)
+        
+        self.filas = esquema["filas"]
+        self.columnas = {}
+        for nombre in esquema["columnas"]:
+            if self.filas == 0:
+                self.columnas[nombre] = np.empty(0, dtype=esquema["tipo"])
+            else:
+                self.columnas[nombre] = np.memmap(os.path.join(ruta, f"{nombre}.bin"), dtype=esquema["tipo"],
+                                                  mode='r', shape=(self.filas,))
+    
+    def __len__(self):
+        return self.filas
+    
+    def bloques(self, *nombres, tam_bloque=TAM_BLOQUE * 16):
+        # Recorre las columnas pedidas por bloques: solo un bloque se lee a la vez
+        for inicio in range(0, self.filas, tam_bloque):
+            yield tuple(np.asarray(self.columnas[nombre][inicio:inicio + tam_bloque]) for nombre in nombres)
+    
+    def valores_metrica(self, metrica):
+        # Genera por bloques los valores de espera, retorno o respuesta de los procesos con tiempos conocidos
+        if metrica not in self.METRICAS:
+            raise ValueError(f"Métrica desconocida: {metrica}")
+        
+        for llegada, inicio, fin, ejecucion in self.bloques("tiempo_llegada", "tiempo_inicio", "tiempo_fin",
+                                                             "tiempo_ejecucion"):
+            if metrica == "respuesta":
+                validos = (llegada >= 0) & (inicio >= 0)
+                valores = inicio[validos] - llegada[validos]
+            else:
+                validos = (llegada >= 0) & (fin >= 0)
+                valores = fin[validos] - llegada[validos]
+                if metrica == "espera":
+                    valores = valores - ejecucion[validos]
+            yield valores[valores >= 0]
+    
+    def percentiles(self, metrica="espera", percentiles=(50, 90, 95, 99)):
+        # Percentiles exactos (rango más cercano): los tiempos son ticks enteros, así que basta
+        # con acumular un histograma por bloques, con memoria proporcional al valor máximo
+        conteos = np.zeros(1, dtype=np.int64)
+        for valores in self.valores_metrica(metrica):
+            if len(valores) == 0:
+                continue
+            parcial = np.bincount(valores)
+            if len(parcial) > len(conteos):
+                conteos = np.concatenate((conteos, np.zeros(len(parcial) - len(conteos), dtype=np.int64)))
+            conteos[:len(parcial)] += parcial
+        
+        acumulado = np.cumsum(conteos)
+        total = int(acumulado[-1])
+        if total == 0:
+            return {p: None for p in percentiles}
+        
+        resultado = {}
+        for p in percentiles:
+            rango = max(int(np.ceil(p / 100 * total)), 1)
+            resultado[p] = int(np.searchsorted(acumulado, rango))
+        return resultado
+    
+    def promedio(self, metrica="espera"):
+        suma = 0
+        cantidad = 0
+        for valores in self.valores_metrica(metrica):
+            suma += int(valores.sum())
+            cantidad += len(valores)
+        return suma / cantidad if cantidad > 0 else 0
+    
+    def utilizacion_particiones(self, horizonte=None):
+        # Por partición: procesos atendidos, fracción del horizonte ocupada y fragmentación
+        # interna promedio. La ocupación mide la vida del proceso en la partición, desde la
+        # asignación hasta el fin; con núcleos ilimitados la partición se libera un tick
+        # después del fin y ese tick no se cuenta. El horizonte por defecto va de la primera
+        # llegada al último fin registrados.
+        procesos = np.zeros(0, dtype=np.int64)
+        ocupacion = np.zeros(0)
+        fragmentacion = np.zeros(0)
+        primera_llegada = None
+        ultimo_fin = None
+        
+        for particion, asignacion, fin, frag, llegada in self.bloques(
+                "particion_id", "tiempo_asignacion", "tiempo_fin", "fragmentacion_interna", "tiempo_llegada"):
+            validos = (particion >= 0) & (asignacion >= 0) & (fin >= 0)
+            particion = particion[validos]
+            if len(particion) == 0:
+                continue
+            
+            largo = int(particion.max()) + 1
+            if largo > len(procesos):
+                extra = largo - len(procesos)
+                procesos = np.concatenate((procesos, np.zeros(extra, dtype=np.int64)))
+                ocupacion = np.concatenate((ocupacion, np.zeros(extra)))
+                fragmentacion = np.concatenate((fragmentacion, np.zeros(extra)))
+            
+            procesos[:largo] += np.bincount(particion, minlength=largo)
+            ocupacion[:largo] += np.bincount(particion, weights=fin[validos] - asignacion[validos], minlength=largo)
+            fragmentacion[:largo] += np.bincount(particion, weights=frag[validos], minlength=largo)
+            
+            llegadas = llegada[validos & (llegada >= 0)]
+            if len(llegadas) > 0:
+                minimo = int(llegadas.min())
+                primera_llegada = minimo if primera_llegada is None else min(primera_llegada, minimo)
+            maximo = int(fin[validos].max())
+            ultimo_fin = maximo if ultimo_fin is None else max(ultimo_fin, maximo)
+        
+        if horizonte is None:
+            horizonte = (ultimo_fin - primera_llegada) if ultimo_fin is not None and primera_llegada is not None else 0
+        
+        resultado = {}
+        for particion_id in np.nonzero(procesos)[0]:
+            cantidad = int(procesos[particion_id])
+            resultado[int(particion_id)] = {
+                "procesos": cantidad,
+                "ocupacion": float(ocupacion[particion_id]) / horizonte if horizonte > 0 else 0,
+                "fragmentacion_promedio": float(fragmentacion[particion_id]) / cantidad
+            }
+        return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de un historial de procesos exportado.")
+    parser.add_argument("historial", help="Directorio columnar exportado por el simulador")
+    args = parser.parse_args()
+    
+    historial = HistorialColumnar(args.historial)
+    print(f"{len(historial)} procesos completados")
+    for metrica in HistorialColumnar.METRICAS:
+        valores = historial.percentiles(metrica)
+        detalle = ", ".join(f"p{p}={v}" for p, v in valores.items())
+        print(f"{metrica.capitalize()}: promedio {historial.promedio(metrica):.2f} ticks ({detalle})")
+    
+    print("Utilización por partición:")
+    for particion_id, datos in historial.utilizacion_particiones().items():
+        print(f"  Partición {particion_id}: {datos['procesos']} procesos, "
+              f"ocupada por procesos {datos['ocupacion'] * 100:.1f}%, frag. promedio {datos['fragmentacion_promedio']:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
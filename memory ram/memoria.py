@@ -0,0 +1,277 @@
+"""
+Modelo de memoria (procesos y particiones) y dibujo del mapa de memoria.
+
+No depende de Tk: lo usan tanto la interfaz (ram.py) como el renderizado sin
+interfaz (renderizado.py).
+"""
+import random
+import matplotlib.patches as patches
+import matplotlib.colors as mcolors
+import numpy as np
+
+
+# Ancho mínimo en pantalla (píxeles) de cada partición visible para dibujarlas una a una;
+# si las particiones son más angostas, el mapa de memoria se dibuja agregado por píxel
+ANCHO_MINIMO_PARTICION = 3
+
+# Ancho mínimo en pantalla (píxeles) de un bloque para mostrar su etiqueta
+ANCHO_MINIMO_ETIQUETA = 45
+
+class Proceso:
+    def __init__(self, id, tamano, tiempo_ejecucion, prioridad=0):
+        self.id = id
+        self.tamano = tamano
+        self.tiempo_ejecucion = tiempo_ejecucion
+        self.tiempo_restante = tiempo_ejecucion
+        self.prioridad = prioridad  # Menor número = mayor prioridad
+        self.color = self.generar_color_aleatorio()
+        self.particion_id = None
+        self.fragmentacion_interna = None
+        
+        # Tiempos para las métricas de planificación (en ticks)
+        self.tiempo_llegada = None
+        self.tiempo_asignacion = None
+        self.tiempo_inicio = None
+        self.tiempo_fin = None
+    
+    def generar_color_aleatorio(self):
+        # Colores vibrantes pero no demasiado claros para que se pueda leer el texto
+        r = random.randint(50, 200)
+        g = random.randint(50, 200)
+        b = random.randint(50, 200)
+        return f'#{r:02x}{g:02x}{b:02x}'
+    
+    def ejecutar(self):
+        if self.tiempo_restante > 0:
+            self.tiempo_restante -= 1
+            return True
+        return False
+    
+    def tiempo_retorno(self):
+        if self.tiempo_fin is None or self.tiempo_llegada is None:
+            return None
+        return self.tiempo_fin - self.tiempo_llegada
+    
+    def tiempo_espera(self):
+        retorno = self.tiempo_retorno()
+        return None if retorno is None else retorno - self.tiempo_ejecucion
+    
+    def tiempo_respuesta(self):
+        if self.tiempo_inicio is None or self.tiempo_llegada is None:
+            return None
+        return self.tiempo_inicio - self.tiempo_llegada
+    
+    def cargar_tiempos(self, datos):
+        # Restaura prioridad y tiempos de un estado guardado (ausentes en estados antiguos)
+        self.prioridad = datos.get("prioridad", 0)
+        self.tiempo_llegada = datos.get("tiempo_llegada")
+        self.tiempo_asignacion = datos.get("tiempo_asignacion")
+        self.tiempo_inicio = datos.get("tiempo_inicio")
+        self.tiempo_fin = datos.get("tiempo_fin")
+    
+    def __str__(self):
+        return f"Proceso {self.id} ({self.tamano} KB, {self.tiempo_restante}/{self.tiempo_ejecucion}s)"
+
+class Particion:
+    def __init__(self, id, tamano):
+        self.id = id
+        self.tamano = tamano
+        self.proceso = None
+        self.fragmentacion_interna = 0
+    
+    def asignar_proceso(self, proceso):
+        if proceso.tamano <= self.tamano:
+            self.proceso = proceso
+            self.fragmentacion_interna = self.tamano - proceso.tamano
+            proceso.particion_id = self.id
+            proceso.fragmentacion_interna = self.fragmentacion_interna
+            return True
+        return False
+    
+    def liberar(self):
+        proceso_liberado = self.proceso
+        self.proceso = None
+        self.fragmentacion_interna = 0
+        return proceso_liberado
+    
+    def esta_libre(self):
+        return self.proceso is None
+    
+    def __str__(self):
+        estado = f"Libre ({self.tamano} KB)" if self.esta_libre() else f"{self.proceso} - Frag.Int: {self.fragmentacion_interna} KB"
+        return f"Partición {self.id}: {estado}"
+
+
+def particiones_desde_cuadro(cuadro):
+    # Reconstruye las particiones de un cuadro del diario para poder dibujarlas
+    particiones = []
+    for datos in cuadro["particiones"]:
+        particion = Particion(datos[0], datos[1])
+        if len(datos) > 2:
+            proceso = Proceso(datos[2], datos[3], 0)
+            proceso.color = datos[4]
+            particion.asignar_proceso(proceso)
+            particion.fragmentacion_interna = datos[5]
+        particiones.append(particion)
+    return particiones
+
+
+def calcular_inicios(particiones):
+    # Posición (KB) donde empieza cada partición, más el final de la última
+    return np.concatenate(([0], np.cumsum([p.tamano for p in particiones])))
+
+
+def indice_particion(inicios, posicion):
+    # Índice de la partición que contiene la posición (KB)
+    return max(int(np.searchsorted(inicios, posicion, side='right')) - 1, 0)
+
+
+def ajustar_vista(vista, memoria_total):
+    # Recorta la vista (inicio, fin) en KB a la memoria; si queda vacía se muestra toda
+    if vista is not None and memoria_total > 0:
+        x_min = max(vista[0], 0)
+        x_max = min(vista[1], memoria_total)
+        if x_min < x_max:
+            return x_min, x_max
+    return 0, memoria_total
+
+
+def dibujar_memoria(ax, particiones, memoria_total, vista=None, inicios=None):
+    # vista: rango (inicio, fin) en KB a mostrar; None muestra toda la memoria
+    x_min, x_max = ajustar_vista(vista, memoria_total)
+    
+    # Limpiar gráfico
+    ax.clear()
+    
+    # Configurar aspecto del gráfico
+    ax.set_ylim(0, 1)
+    ax.set_xlim(x_min, x_max)
+    ax.set_title('Estado de la Memoria RAM')
+    ax.set_xlabel('Tamaño (KB)')
+    ax.get_yaxis().set_visible(False)
+    
+    # Variables para el seguimiento
+    altura_bloque = 0.6
+    y_pos = 0.2
+    
+    if not particiones:
+        return
+    
+    # Particiones que caen dentro de la vista
+    if inicios is None:
+        inicios = calcular_inicios(particiones)
+    primera = indice_particion(inicios, x_min)
+    ultima = min(int(np.searchsorted(inicios, x_max, side='left')), len(particiones))
+    
+    # Nivel de detalle según el ancho en pantalla: si las particiones visibles no caben con
+    # unos píxeles cada una se dibuja una sola imagen
+    ancho_pixeles = ax.get_window_extent().width
+    if (ultima - primera) * ANCHO_MINIMO_PARTICION > ancho_pixeles:
+        dibujar_memoria_agregada(ax, particiones[primera:ultima], inicios[primera:ultima + 1],
+                                 x_min, x_max, y_pos, altura_bloque)
+        ax.text((x_min + x_max) / 2, y_pos + altura_bloque/2 + 0.1,
+                f"{ultima - primera} particiones visibles (acerque para ver detalles)",
+                ha='center', va='center', color='black', fontsize=8)
+        return
+    
+    pos_inicio = int(inicios[primera])
+    pixeles_por_kb = ancho_pixeles / (x_max - x_min) if x_max > x_min else 0
+    
+    def cabe_etiqueta(tamano):
+        return tamano * pixeles_por_kb >= ANCHO_MINIMO_ETIQUETA
+    
+    # Dibujar cada partición
+    for particion in particiones[primera:ultima]:
+        # Rectángulo de la partición
+        rect = patches.Rectangle((pos_inicio, y_pos - altura_bloque/2), 
+                                 particion.tamano, altura_bloque,
+                                 linewidth=1, edgecolor='black', facecolor='lightgray')
+        ax.add_patch(rect)
+        
+        # Si hay un proceso en la partición
+        if not particion.esta_libre():
+            # Rectángulo del proceso
+            proc_rect = patches.Rectangle((pos_inicio, y_pos - altura_bloque/2), 
+                                          particion.proceso.tamano, altura_bloque,
+                                          linewidth=0, facecolor=particion.proceso.color)
+            ax.add_patch(proc_rect)
+            
+            # Etiqueta del proceso
+            if cabe_etiqueta(particion.proceso.tamano):
+                ax.text(pos_inicio + particion.proceso.tamano/2, y_pos, 
+                        f"P{particion.proceso.id}\n{particion.proceso.tamano} KB",
+                        ha='center', va='center', color='white', 
+                        fontweight='bold', fontsize=10)
+            
+            # Mostrar fragmentación si existe
+            if particion.fragmentacion_interna > 0:
+                # Línea punteada para separar proceso y fragmentación
+                ax.plot([pos_inicio + particion.proceso.tamano, pos_inicio + particion.proceso.tamano],
+                        [y_pos - altura_bloque/2, y_pos + altura_bloque/2],
+                        'k--', linewidth=1)
+                
+                # Etiqueta de fragmentación
+                if cabe_etiqueta(particion.fragmentacion_interna):
+                    ax.text(pos_inicio + particion.proceso.tamano + particion.fragmentacion_interna/2, y_pos,
+                            f"Frag.\n{particion.fragmentacion_interna} KB",
+                            ha='center', va='center', color='black', 
+                            fontsize=8)
+        elif cabe_etiqueta(particion.tamano):
+            # Etiqueta para partición libre
+            ax.text(pos_inicio + particion.tamano/2, y_pos, 
+                    f"Libre\n{particion.tamano} KB",
+                    ha='center', va='center', color='black', 
+                    fontweight='bold', fontsize=10)
+        
+        # Etiqueta de la partición
+        if cabe_etiqueta(particion.tamano):
+            ax.text(pos_inicio + particion.tamano/2, y_pos - altura_bloque/2 - 0.1,
+                    f"Partición {particion.id}",
+                    ha='center', va='center', color='black', fontsize=8)
+        
+        # Actualizar posición para la siguiente partición
+        pos_inicio += particion.tamano
+
+
+def dibujar_memoria_agregada(ax, particiones, inicios, x_min, x_max, y_pos, altura_bloque):
+    # Una columna por píxel del eje: cada columna toma el color promedio de lo que contiene,
+    # ponderado por KB (color de cada proceso, gris para espacio libre o fragmentación).
+    # particiones son las visibles e inicios sus posiciones, más el final de la última.
+    columnas = max(int(ax.get_window_extent().width), 1)
+    bordes = np.linspace(x_min, x_max, columnas + 1)
+    
+    gris = np.array(mcolors.to_rgb('lightgray'))
+    colores = {}
+    
+    def color(proceso):
+        if proceso.color not in colores:
+            colores[proceso.color] = mcolors.to_rgb(proceso.color)
+        return colores[proceso.color]
+    
+    # KB ocupados por proceso al comienzo de cada partición y diferencia de su color con el gris
+    procesos = [(i, p.proceso) for i, p in enumerate(particiones) if p.proceso is not None]
+    usados = np.zeros(len(particiones))
+    exceso = np.zeros((len(particiones), 3))
+    if procesos:
+        ocupadas = [i for i, _ in procesos]
+        usados[ocupadas] = [proceso.tamano for _, proceso in procesos]
+        exceso[ocupadas] = np.array([color(proceso) for _, proceso in procesos]) - gris
+    
+    # Suma acumulada de exceso * KB hasta cada borde: el color de una columna es el gris más
+    # la diferencia entre sus dos bordes dividida por el ancho de la columna
+    acumulado = np.concatenate((np.zeros((1, 3)), np.cumsum(exceso * usados[:, None], axis=0)))
+    indices = np.clip(np.searchsorted(inicios, bordes, side='right') - 1, 0, len(particiones) - 1)
+    ocupado = np.minimum(bordes - inicios[indices], usados[indices])
+    hasta_borde = acumulado[indices] + exceso[indices] * ocupado[:, None]
+    
+    ancho_columna = (x_max - x_min) / columnas
+    imagen = np.clip(gris + np.diff(hasta_borde, axis=0) / ancho_columna, 0, 1)[None, :, :]
+    
+    ax.imshow(imagen, extent=(x_min, x_max, y_pos - altura_bloque/2, y_pos + altura_bloque/2),
+              aspect='auto', interpolation='nearest')
+    ax.add_patch(patches.Rectangle((x_min, y_pos - altura_bloque/2), x_max - x_min, altura_bloque,
+                                   linewidth=1, edgecolor='black', facecolor='none'))
+    
+    # imshow ajusta los límites a la imagen; se restauran los del mapa
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(0, 1)
@@ -1,62 +1,112 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser
-import random
+import heapq
+from collections import deque
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.patches as patches
+from matplotlib.ticker import MaxNLocator, FuncFormatter
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import json
 import os
+from memoria import Proceso, Particion, calcular_inicios, indice_particion, ajustar_vista, dibujar_memoria
+from historial import ExportadorHistorial, exportar_historial
 
-class Proceso:
-    def __init__(self, id, tamano, tiempo_ejecucion):
-        self.id = id
-        self.tamano = tamano
-        self.tiempo_ejecucion = tiempo_ejecucion
-        self.tiempo_restante = tiempo_ejecucion
-        self.color = self.generar_color_aleatorio()
-    
-    def generar_color_aleatorio(self):
-        # Colores vibrantes pero no demasiado claros para que se pueda leer el texto
-        r = random.randint(50, 200)
-        g = random.randint(50, 200)
-        b = random.randint(50, 200)
-        return f'#{r:02x}{g:02x}{b:02x}'
-    
-    def ejecutar(self):
-        if self.tiempo_restante > 0:
-            self.tiempo_restante -= 1
-            return True
-        return False
-    
-    def __str__(self):
-        return f"Proceso {self.id} ({self.tamano} KB, {self.tiempo_restante}/{self.tiempo_ejecucion}s)"
+# Opción del selector de política que conserva el modelo de núcleos ilimitados
+SIN_PLANIFICADOR = "Núcleos ilimitados"
 
-class Particion:
-    def __init__(self, id, tamano):
-        self.id = id
-        self.tamano = tamano
-        self.proceso = None
-        self.fragmentacion_interna = 0
-    
-    def asignar_proceso(self, proceso):
-        if proceso.tamano <= self.tamano:
-            self.proceso = proceso
-            self.fragmentacion_interna = self.tamano - proceso.tamano
-            return True
-        return False
+# Máximo de filas en la lista de particiones: se listan las que muestra el mapa desde su borde izquierdo
+MAX_FILAS_PARTICIONES = 200
+
+# Máximo de barras por gráfica de estadísticas: con más particiones cada barra agrupa varias consecutivas
+MAX_BARRAS_ESTADISTICAS = 40
+
+class PlanificadorCPU:
+    POLITICAS = ("FCFS", "SJF", "SRTF", "Prioridad", "Round Robin")
+    
+    def __init__(self, politica="FCFS", nucleos=1, quantum=2):
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de planificación desconocida: {politica}")
+        if nucleos <= 0 or quantum <= 0:
+            raise ValueError("Los núcleos y el quantum deben ser positivos")
+        
+        self.politica = politica
+        self.nucleos = nucleos
+        self.quantum = quantum
+        
+        # Cola de listos: FIFO para FCFS y Round Robin, montículo (clave, llegada, proceso)
+        # para las demás, de modo que cada decisión cuesta O(log n)
+        self.listos = deque() if politica in ("FCFS", "Round Robin") else []
+        self.secuencia = 0  # Desempate por orden de llegada en el montículo
+        
+        self.en_ejecucion = []  # [proceso, ticks consumidos del quantum]
+        self.ticks_ocupados = 0  # Suma de núcleos ocupados en cada tick
+        self.ticks_totales = 0
     
-    def liberar(self):
-        proceso_liberado = self.proceso
-        self.proceso = None
-        self.fragmentacion_interna = 0
-        return proceso_liberado
+    def clave(self, proceso):
+        if self.politica == "SJF":
+            return proceso.tiempo_ejecucion
+        if self.politica == "SRTF":
+            return proceso.tiempo_restante
+        return proceso.prioridad
     
-    def esta_libre(self):
-        return self.proceso is None
+    def agregar(self, proceso):
+        if isinstance(self.listos, deque):
+            self.listos.append(proceso)
+        else:
+            heapq.heappush(self.listos, (self.clave(proceso), self.secuencia, proceso))
+            self.secuencia += 1
+    
+    def siguiente(self):
+        if isinstance(self.listos, deque):
+            return self.listos.popleft()
+        return heapq.heappop(self.listos)[2]
+    
+    def procesos_listos(self):
+        return len(self.listos)
+    
+    def ejecutar_tick(self, tiempo_inicio_tick):
+        # Ejecuta un tick en los núcleos y devuelve los procesos que terminaron
+        if self.politica == "SRTF":
+            # Expropiativo: los procesos en ejecución vuelven a competir con los listos
+            for proceso, _ in self.en_ejecucion:
+                self.agregar(proceso)
+            self.en_ejecucion = []
+        
+        while len(self.en_ejecucion) < self.nucleos and self.listos:
+            self.en_ejecucion.append([self.siguiente(), 0])
+        
+        self.ticks_totales += 1
+        self.ticks_ocupados += len(self.en_ejecucion)
+        
+        terminados = []
+        continuan = []
+        for entrada in self.en_ejecucion:
+            proceso = entrada[0]
+            if proceso.tiempo_inicio is None:
+                proceso.tiempo_inicio = tiempo_inicio_tick
+            proceso.ejecutar()
+            entrada[1] += 1
+            
+            if proceso.tiempo_restante == 0:
+                proceso.tiempo_fin = tiempo_inicio_tick + 1
+                terminados.append(proceso)
+            elif self.politica == "Round Robin" and entrada[1] >= self.quantum:
+                self.agregar(proceso)  # Agotó su quantum: al final de la cola
+            else:
+                continuan.append(entrada)
+        
+        self.en_ejecucion = continuan
+        return terminados
+    
+    def utilizacion(self):
+        if self.ticks_totales == 0:
+            return 0
+        return self.ticks_ocupados / (self.ticks_totales * self.nucleos) * 100
     
     def __str__(self):
-        estado = f"Libre ({self.tamano} KB)" if self.esta_libre() else f"{self.proceso} - Frag.Int: {self.fragmentacion_interna} KB"
-        return f"Partición {self.id}: {estado}"
+        detalle = f", quantum {self.quantum}" if self.politica == "Round Robin" else ""
+        return f"{self.politica} ({self.nucleos} núcleos{detalle})"
 
 class AdministradorMemoria:
     def __init__(self):
@@ -66,6 +116,13 @@ class AdministradorMemoria:
         self.tiempo_actual = 0
         self.id_proceso = 1
         self.memoria_total = 0
+        self.diario = None
+        self.exportador = None
+        self.reiniciar_metricas()
+        
+        # Sin planificador cada proceso residente recibe un tick de CPU por tick,
+        # como si hubiera tantos núcleos como particiones
+        self.planificador = None
     
     def crear_particiones(self, tamanos):
         self.particiones = []
@@ -73,12 +130,26 @@ class AdministradorMemoria:
             self.particiones.append(Particion(i+1, tamano))
             self.memoria_total += tamano
     
-    def crear_proceso(self, tamano, tiempo_ejecucion):
-        proceso = Proceso(self.id_proceso, tamano, tiempo_ejecucion)
+    def configurar_planificador(self, politica, nucleos=1, quantum=2):
+        # politica=None vuelve al modelo de núcleos ilimitados
+        if politica is None:
+            self.planificador = None
+            return
+        
+        self.planificador = PlanificadorCPU(politica, nucleos, quantum)
+        # Los procesos ya residentes en memoria pasan a la cola de listos
+        for particion in self.particiones:
+            if not particion.esta_libre():
+                self.planificador.agregar(particion.proceso)
+    
+    def crear_proceso(self, tamano, tiempo_ejecucion, prioridad=0):
+        proceso = Proceso(self.id_proceso, tamano, tiempo_ejecucion, prioridad)
         self.id_proceso += 1
         return proceso
     
     def agregar_proceso_a_cola(self, proceso):
+        if proceso.tiempo_llegada is None:
+            proceso.tiempo_llegada = self.tiempo_actual
         self.cola_espera.append(proceso)
     
     def asignar_procesos(self):
@@ -95,6 +166,9 @@ class AdministradorMemoria:
             for particion in self.particiones:
                 if particion.esta_libre() and proceso.tamano <= particion.tamano:
                     particion.asignar_proceso(proceso)
+                    proceso.tiempo_asignacion = self.tiempo_actual
+                    if self.planificador is not None:
+                        self.planificador.agregar(proceso)
                     proceso_ubicado = True
                     asignado = True
                     break
@@ -109,15 +183,50 @@ class AdministradorMemoria:
         self.tiempo_actual += 1
         procesos_terminados = []
         
+        if self.planificador is not None:
+            # Solo avanzan los procesos que el planificador pone en un núcleo
+            for proceso in self.planificador.ejecutar_tick(self.tiempo_actual - 1):
+                # Los ids de partición son consecutivos desde 1
+                self.particiones[proceso.particion_id - 1].liberar()
+                self.registrar_completado(proceso)
+                procesos_terminados.append(proceso)
+            return procesos_terminados
+        
         for particion in self.particiones:
             if not particion.esta_libre():
-                if not particion.proceso.ejecutar():  # Si el proceso terminó
+                proceso = particion.proceso
+                if proceso.tiempo_inicio is None:
+                    proceso.tiempo_inicio = self.tiempo_actual - 1
+                if proceso.ejecutar():
+                    if proceso.tiempo_restante == 0:
+                        # Termina en este tick, aunque la partición se libera en el siguiente
+                        proceso.tiempo_fin = self.tiempo_actual
+                else:  # Si el proceso terminó
                     proceso_terminado = particion.liberar()
-                    self.procesos_completados.append(proceso_terminado)
+                    if proceso_terminado.tiempo_fin is None:  # Estados guardados sin tiempo_fin (versiones anteriores)
+                        proceso_terminado.tiempo_fin = self.tiempo_actual - 1
+                    self.registrar_completado(proceso_terminado)
                     procesos_terminados.append(proceso_terminado)
         
         return procesos_terminados
     
+    def registrar_completado(self, proceso):
+        self.procesos_completados.append(proceso)
+        self.acumular_metricas(proceso)
+        if self.exportador is not None:
+            self.exportador.agregar(proceso)
+    
+    def iniciar_exportacion(self, ruta_columnar="historial_procesos", ruta_csv="historial_procesos.csv"):
+        # Exporta por bloques el historial ya completado y cada proceso que termine después
+        self.cerrar_exportacion()
+        self.exportador = ExportadorHistorial(ruta_columnar, ruta_csv)
+        self.exportador.agregar_varios(self.procesos_completados)
+    
+    def cerrar_exportacion(self):
+        if self.exportador is not None:
+            self.exportador.cerrar()
+            self.exportador = None
+    
     def calcular_estadisticas(self):
         # Uso de memoria
         memoria_usada = sum(p.tamano for p in self.particiones if not p.esta_libre())
@@ -142,11 +251,44 @@ class AdministradorMemoria:
             "procesos_finalizados": procesos_finalizados
         }
     
+    def reiniciar_metricas(self):
+        # Sumas acumuladas de los procesos completados con tiempos conocidos
+        self.suma_espera = 0
+        self.suma_retorno = 0
+        self.suma_respuesta = 0
+        self.procesos_medidos = 0
+    
+    def acumular_metricas(self, proceso):
+        retorno = proceso.tiempo_retorno()
+        respuesta = proceso.tiempo_respuesta()
+        if retorno is None or respuesta is None:
+            return  # Procesos de estados guardados sin tiempos
+        self.suma_retorno += retorno
+        self.suma_espera += retorno - proceso.tiempo_ejecucion
+        self.suma_respuesta += respuesta
+        self.procesos_medidos += 1
+    
+    def calcular_metricas_planificacion(self):
+        # Promedios de espera, retorno y respuesta a partir de las sumas acumuladas
+        medidos = self.procesos_medidos
+        return {
+            "espera_promedio": self.suma_espera / medidos if medidos > 0 else 0,
+            "retorno_promedio": self.suma_retorno / medidos if medidos > 0 else 0,
+            "respuesta_promedio": self.suma_respuesta / medidos if medidos > 0 else 0,
+            "procesos_listos": self.planificador.procesos_listos() if self.planificador else 0,
+            "utilizacion_cpu": self.planificador.utilizacion() if self.planificador else None
+        }
+    
     def guardar_estado(self, filename="estado_memoria.json"):
         estado = {
             "tiempo_actual": self.tiempo_actual,
             "id_proceso": self.id_proceso,
             "memoria_total": self.memoria_total,
+            "planificador": {
+                "politica": self.planificador.politica,
+                "nucleos": self.planificador.nucleos,
+                "quantum": self.planificador.quantum
+            } if self.planificador else None,
             "particiones": [
                 {
                     "id": p.id,
@@ -156,7 +298,12 @@ class AdministradorMemoria:
                         "tamano": p.proceso.tamano,
                         "tiempo_ejecucion": p.proceso.tiempo_ejecucion,
                         "tiempo_restante": p.proceso.tiempo_restante,
-                        "color": p.proceso.color
+                        "color": p.proceso.color,
+                        "prioridad": p.proceso.prioridad,
+                        "tiempo_llegada": p.proceso.tiempo_llegada,
+                        "tiempo_asignacion": p.proceso.tiempo_asignacion,
+                        "tiempo_inicio": p.proceso.tiempo_inicio,
+                        "tiempo_fin": p.proceso.tiempo_fin
                     } if p.proceso else None,
                     "fragmentacion_interna": p.fragmentacion_interna
                 }
@@ -168,7 +315,9 @@ class AdministradorMemoria:
                     "tamano": p.tamano,
                     "tiempo_ejecucion": p.tiempo_ejecucion,
                     "tiempo_restante": p.tiempo_restante,
-                    "color": p.color
+                    "color": p.color,
+                    "prioridad": p.prioridad,
+                    "tiempo_llegada": p.tiempo_llegada
                 }
                 for p in self.cola_espera
             ],
@@ -177,7 +326,14 @@ class AdministradorMemoria:
                     "id": p.id,
                     "tamano": p.tamano,
                     "tiempo_ejecucion": p.tiempo_ejecucion,
-                    "color": p.color
+                    "color": p.color,
+                    "prioridad": p.prioridad,
+                    "tiempo_llegada": p.tiempo_llegada,
+                    "tiempo_asignacion": p.tiempo_asignacion,
+                    "tiempo_inicio": p.tiempo_inicio,
+                    "tiempo_fin": p.tiempo_fin,
+                    "particion_id": p.particion_id,
+                    "fragmentacion_interna": p.fragmentacion_interna
                 }
                 for p in self.procesos_completados
             ]
@@ -194,6 +350,9 @@ class AdministradorMemoria:
             with open(filename, 'r') as f:
                 estado = json.load(f)
             
+            # El historial cargado reemplaza al que se estaba exportando
+            self.cerrar_exportacion()
+            
             self.tiempo_actual = estado["tiempo_actual"]
             self.id_proceso = estado["id_proceso"]
             self.memoria_total = estado["memoria_total"]
@@ -207,6 +366,7 @@ class AdministradorMemoria:
                     proceso = Proceso(proceso_data["id"], proceso_data["tamano"], proceso_data["tiempo_ejecucion"])
                     proceso.tiempo_restante = proceso_data["tiempo_restante"]
                     proceso.color = proceso_data["color"]
+                    proceso.cargar_tiempos(proceso_data)
                     particion.asignar_proceso(proceso)
                     particion.fragmentacion_interna = p_data["fragmentacion_interna"]
                 self.particiones.append(particion)
@@ -217,20 +377,62 @@ class AdministradorMemoria:
                 proceso = Proceso(p_data["id"], p_data["tamano"], p_data["tiempo_ejecucion"])
                 proceso.tiempo_restante = p_data["tiempo_restante"]
                 proceso.color = p_data["color"]
+                proceso.cargar_tiempos(p_data)
                 self.cola_espera.append(proceso)
             
             # Recrear procesos completados
             self.procesos_completados = []
+            self.reiniciar_metricas()
             for p_data in estado["procesos_completados"]:
                 proceso = Proceso(p_data["id"], p_data["tamano"], p_data["tiempo_ejecucion"])
                 proceso.tiempo_restante = 0
                 proceso.color = p_data["color"]
+                proceso.cargar_tiempos(p_data)
+                proceso.particion_id = p_data.get("particion_id")
+                proceso.fragmentacion_interna = p_data.get("fragmentacion_interna")
                 self.procesos_completados.append(proceso)
+                self.acumular_metricas(proceso)
+            
+            # Recrear el planificador con los procesos residentes
+            planificador = estado.get("planificador")
+            if planificador:
+                self.configurar_planificador(planificador["politica"], planificador["nucleos"],
+                                             planificador["quantum"])
+            else:
+                self.planificador = None
                 
             return True
         except Exception as e:
             print(f"Error cargando estado: {e}")
             return False
+    
+    def capturar_cuadro(self):
+        # Estado compacto del mapa de memoria: [id, tamaño] si la partición está libre,
+        # [id, tamaño, id_proceso, tamaño_proceso, color, frag_interna] si está ocupada
+        return {
+            "tiempo": self.tiempo_actual,
+            "memoria_total": self.memoria_total,
+            "particiones": [
+                [p.id, p.tamano] if p.esta_libre() else
+                [p.id, p.tamano, p.proceso.id, p.proceso.tamano, p.proceso.color, p.fragmentacion_interna]
+                for p in self.particiones
+            ]
+        }
+    
+    def iniciar_diario(self, filename="diario_memoria.jsonl"):
+        # Diario de ejecución: una línea JSON por cuadro registrado
+        self.cerrar_diario()
+        self.diario = open(filename, 'w')
+        self.registrar_cuadro()
+    
+    def registrar_cuadro(self):
+        if self.diario is not None:
+            self.diario.write(json.dumps(self.capturar_cuadro(), separators=(',', ':')) + "\n")
+    
+    def cerrar_diario(self):
+        if self.diario is not None:
+            self.diario.close()
+            self.diario = None
 
 
 class SimuladorMemoriaGUI:
@@ -247,6 +449,23 @@ class SimuladorMemoriaGUI:
         self.ejecutando_auto = False
         self.velocidad_auto = 1.0  # segundos entre ticks
         
+        # Vista del mapa de memoria (zoom) y caché de posiciones de las particiones
+        self.vista_memoria = None
+        self.inicios_cache = (None, None)
+        self.arrastrando = False
+        self.refinado_pendiente = False
+        
+        # Pestañas pendientes de redibujar y gráficas de estadísticas actualizadas en el lugar
+        self.simulacion_pendiente = False
+        self.estadisticas_pendiente = False
+        self.barras_particiones = None
+        self.barras_uso = []
+        self.barras_frag = []
+        self.grupos_barras = None  # Índice de la primera partición de cada barra, si se agrupan
+        self.layout_pendiente = False
+        self.completados_mostrados = (None, 0)
+        self.filas_particiones = []
+        
         self.crear_interfaz()
     
     def crear_interfaz(self):
@@ -270,6 +489,7 @@ class SimuladorMemoriaGUI:
         self.tab_control.add(self.tab_estadisticas, text='Estadísticas')
         
         self.tab_control.pack(expand=1, fill=tk.BOTH)
+        self.tab_control.bind('<<NotebookTabChanged>>', self.actualizar_pestana_visible)
         
         # Configurar el contenido de cada pestaña
         self.configurar_tab_config()
@@ -330,9 +550,29 @@ class SimuladorMemoriaGUI:
                   command=lambda: self.cargar_plantilla([128, 256, 512, 1024, 2048, 4096])).grid(
             row=2, column=0, padx=5, pady=5, sticky="ew")
         
+        # Frame para el planificador de CPU
+        planificador_frame = ttk.LabelFrame(config_frame, text="Planificación de CPU", padding="10")
+        planificador_frame.grid(row=1, column=2, padx=10, pady=10, sticky="nsew")
+        
+        ttk.Label(planificador_frame, text="Política:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.politica_var = tk.StringVar(value=SIN_PLANIFICADOR)
+        ttk.Combobox(planificador_frame, textvariable=self.politica_var, state="readonly", width=18,
+                     values=(SIN_PLANIFICADOR,) + PlanificadorCPU.POLITICAS).grid(
+            row=0, column=1, padx=5, pady=5, sticky="w")
+        
+        ttk.Label(planificador_frame, text="Núcleos:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.nucleos_var = tk.StringVar(value="1")
+        ttk.Entry(planificador_frame, textvariable=self.nucleos_var, width=10).grid(
+            row=1, column=1, padx=5, pady=5, sticky="w")
+        
+        ttk.Label(planificador_frame, text="Quantum (RR):").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.quantum_var = tk.StringVar(value="2")
+        ttk.Entry(planificador_frame, textvariable=self.quantum_var, width=10).grid(
+            row=2, column=1, padx=5, pady=5, sticky="w")
+        
         # Botón para iniciar simulación
         btn_frame = ttk.Frame(config_frame)
-        btn_frame.grid(row=2, column=0, columnspan=2, pady=20)
+        btn_frame.grid(row=2, column=0, columnspan=3, pady=20)
         
         ttk.Button(btn_frame, text="Iniciar Simulación", style='Accent.TButton',
                   command=self.iniciar_simulacion).pack(pady=10, ipadx=20, ipady=5)
@@ -352,8 +592,17 @@ class SimuladorMemoriaGUI:
         # Visualización gráfica de la memoria
         self.fig, self.ax = plt.subplots(figsize=(6, 5))
         self.canvas = FigureCanvasTkAgg(self.fig, master=panel_izq)
+        
+        # Barra de zoom y desplazamiento; la rueda del ratón también hace zoom
+        self.toolbar = NavigationToolbar2Tk(self.canvas, panel_izq, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
+        self.canvas.mpl_connect('scroll_event', self.zoom_rueda)
+        self.canvas.mpl_connect('button_press_event', self.inicio_arrastre)
+        self.canvas.mpl_connect('button_release_event', self.fin_arrastre)
+        
         # Controles de simulación
         controles_frame = ttk.LabelFrame(panel_izq, text="Controles de Simulación", padding="10")
         controles_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -392,6 +641,11 @@ class SimuladorMemoriaGUI:
                   command=self.cargar_estado).grid(
             row=1, column=3, padx=5, pady=5)
         
+        # Grabación del diario para renderizado sin interfaz (renderizado.py)
+        self.btn_grabar = ttk.Button(controles_frame, text="Grabar Diario",
+                                    command=self.toggle_grabacion)
+        self.btn_grabar.grid(row=1, column=4, padx=5, pady=5)
+        
         # Panel derecho: Procesos y cola
         # Creación de procesos
         crear_proceso_frame = ttk.LabelFrame(panel_der, text="Crear Proceso", padding="10")
@@ -410,6 +664,11 @@ class SimuladorMemoriaGUI:
         ttk.Button(crear_proceso_frame, text="Crear Proceso", command=self.crear_proceso).grid(
             row=0, column=4, padx=5, pady=5)
         
+        ttk.Label(crear_proceso_frame, text="Prioridad:").grid(row=1, column=0, padx=5, pady=5)
+        self.prioridad_proceso_var = tk.StringVar(value="0")
+        ttk.Entry(crear_proceso_frame, textvariable=self.prioridad_proceso_var, width=10).grid(
+            row=1, column=1, padx=5, pady=5)
+        
         # Procesos en cola
         cola_frame = ttk.LabelFrame(panel_der, text="Cola de Procesos", padding="10")
         cola_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -466,6 +725,14 @@ class SimuladorMemoriaGUI:
         self.completados_var = tk.StringVar(value="0")
         ttk.Label(proc_frame, textvariable=self.completados_var, font=("Arial", 10, "bold")).pack(side=tk.LEFT)
         
+        # Planificación de CPU
+        cpu_frame = ttk.Frame(metricas_frame)
+        cpu_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(cpu_frame, text="Planificación:").pack(side=tk.LEFT, padx=5)
+        self.planificacion_var = tk.StringVar(value="-")
+        ttk.Label(cpu_frame, textvariable=self.planificacion_var, font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        
         # Gráficas
         graficas_frame = ttk.Frame(stats_frame)
         graficas_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -474,6 +741,7 @@ class SimuladorMemoriaGUI:
         self.fig_stats, (self.ax_uso, self.ax_frag) = plt.subplots(1, 2, figsize=(10, 4))
         self.canvas_stats = FigureCanvasTkAgg(self.fig_stats, master=graficas_frame)
         self.canvas_stats.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas_stats.get_tk_widget().bind('<Configure>', self.ajustar_layout_estadisticas, add='+')
         
         # Inicializar gráficas
         self.ax_uso.set_title('Distribución de Memoria')
@@ -491,6 +759,9 @@ class SimuladorMemoriaGUI:
         # Lista para mostrar los procesos completados
         self.completados_listbox = tk.Listbox(historial_frame, height=5)
         self.completados_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        ttk.Button(historial_frame, text="Exportar Historial",
+                   command=self.exportar_historial).pack(anchor="e", padx=5)
     
     def generar_campos_particiones(self):
         # Limpiar frame
@@ -537,9 +808,22 @@ class SimuladorMemoriaGUI:
                     raise ValueError("Todos los tamaños deben ser positivos")
                 tamanos.append(tamano)
             
-            # Crear particiones
-            self.admin_memoria = AdministradorMemoria()
-            self.admin_memoria.crear_particiones(tamanos)
+            # Crear particiones y planificador
+            politica = self.politica_var.get()
+            admin_memoria = AdministradorMemoria()
+            admin_memoria.crear_particiones(tamanos)
+            if politica != SIN_PLANIFICADOR:
+                # Núcleos y quantum solo se leen si hay una política de planificación
+                admin_memoria.configurar_planificador(politica, int(self.nucleos_var.get()),
+                                                      int(self.quantum_var.get()))
+            
+            # Reemplazar la simulación anterior (cerrando su diario y su exportación)
+            self.admin_memoria.cerrar_diario()
+            self.admin_memoria.cerrar_exportacion()
+            self.btn_grabar.configure(text="Grabar Diario")
+            self.admin_memoria = admin_memoria
+            self.vista_memoria = None
+            self.toolbar.update()
             
             # Cambiar a la pestaña de simulación
             self.tab_control.select(1)
@@ -554,12 +838,13 @@ class SimuladorMemoriaGUI:
         try:
             tamano = int(self.tamano_proceso_var.get())
             tiempo = int(self.tiempo_proceso_var.get())
+            prioridad = int(self.prioridad_proceso_var.get())
             
             if tamano <= 0 or tiempo <= 0:
                 raise ValueError("El tamaño y tiempo deben ser positivos")
             
             # Crear proceso y añadirlo a la cola
-            proceso = self.admin_memoria.crear_proceso(tamano, tiempo)
+            proceso = self.admin_memoria.crear_proceso(tamano, tiempo, prioridad)
             self.admin_memoria.agregar_proceso_a_cola(proceso)
             
             # Intentar asignar procesos en cola
@@ -578,6 +863,9 @@ class SimuladorMemoriaGUI:
         # Intentar asignar procesos en cola
         self.admin_memoria.asignar_procesos()
         
+        # Registrar el cuadro en el diario si se está grabando
+        self.admin_memoria.registrar_cuadro()
+        
         # Actualizar visualizaciones
         self.actualizar_visualizaciones()
         
@@ -607,8 +895,28 @@ class SimuladorMemoriaGUI:
         velocidad = self.velocidad_var.get()
         self.root.after(int(velocidad * 1000), self.ejecutar_auto)
     
+    def exportar_historial(self):
+        # Rutas distintas de las de iniciar_exportacion para no pisar una exportación en curso
+        ruta_columnar = "historial_exportado"
+        ruta_csv = "historial_exportado.csv"
+        try:
+            filas = exportar_historial(self.admin_memoria.procesos_completados, ruta_columnar, ruta_csv)
+            messagebox.showinfo("Exportación Exitosa",
+                                f"{filas} procesos exportados a {ruta_csv} y {ruta_columnar}/.")
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo exportar el historial: {e}")
+    
+    def toggle_grabacion(self):
+        if self.admin_memoria.diario is None:
+            self.admin_memoria.iniciar_diario()
+            self.btn_grabar.configure(text="Detener Grabación")
+        else:
+            self.admin_memoria.cerrar_diario()
+            self.btn_grabar.configure(text="Grabar Diario")
+    
     def cargar_estado(self):
         if self.admin_memoria.cargar_estado():
+            self.vista_memoria = None
             self.actualizar_visualizaciones()
             messagebox.showinfo("Carga Exitosa", "Estado cargado correctamente.")
         else:
@@ -618,20 +926,67 @@ class SimuladorMemoriaGUI:
         # Actualizar tiempo
         self.tiempo_var.set(f"{self.admin_memoria.tiempo_actual}s")
         
+        # Solo se redibuja la pestaña visible; las demás se actualizan al mostrarse
+        self.simulacion_pendiente = True
+        self.estadisticas_pendiente = True
+        self.actualizar_pestana_visible()
+    
+    def pestana_visible(self, pestana):
+        return self.tab_control.select() == str(pestana)
+    
+    def actualizar_pestana_visible(self, event=None):
+        if self.simulacion_pendiente and self.pestana_visible(self.tab_simulacion):
+            self.simulacion_pendiente = False
+            self.actualizar_tab_simulacion()
+        
+        if self.estadisticas_pendiente and self.pestana_visible(self.tab_estadisticas):
+            self.estadisticas_pendiente = False
+            self.actualizar_tab_estadisticas()
+    
+    def actualizar_tab_simulacion(self):
         # Actualizar visualización de particiones
-        self.particiones_listbox.delete(0, tk.END)
-        for particion in self.admin_memoria.particiones:
-            self.particiones_listbox.insert(tk.END, str(particion))
+        self.actualizar_lista_particiones()
         
         # Actualizar cola de procesos
         self.cola_listbox.delete(0, tk.END)
         for proceso in self.admin_memoria.cola_espera:
             self.cola_listbox.insert(tk.END, str(proceso))
         
-        # Actualizar procesos completados
-        self.completados_listbox.delete(0, tk.END)
-        for proceso in self.admin_memoria.procesos_completados:
+        self.actualizar_grafico_memoria()
+    
+    def actualizar_lista_particiones(self):
+        # Solo se listan hasta MAX_FILAS_PARTICIONES particiones de la vista del mapa, y solo
+        # se reescriben las filas que cambiaron desde la última actualización
+        particiones = self.admin_memoria.particiones
+        primera = 0
+        if self.vista_memoria is not None:
+            primera = indice_particion(self.inicios_particiones(), self.vista_memoria[0])
+        
+        filas = [str(p) for p in particiones[primera:primera + MAX_FILAS_PARTICIONES]]
+        restantes = len(particiones) - primera - len(filas)
+        if restantes > 0:
+            filas.append(f"... {restantes} particiones más (desplace el mapa para verlas)")
+        
+        if len(filas) != len(self.filas_particiones):
+            self.particiones_listbox.delete(0, tk.END)
+            self.particiones_listbox.insert(tk.END, *filas)
+        else:
+            for i, (fila, anterior) in enumerate(zip(filas, self.filas_particiones)):
+                if fila != anterior:
+                    self.particiones_listbox.delete(i)
+                    self.particiones_listbox.insert(i, fila)
+        self.filas_particiones = filas
+    
+    def actualizar_tab_estadisticas(self):
+        # Actualizar procesos completados: solo se agregan los nuevos, salvo que la
+        # lista haya sido reemplazada (nueva simulación o estado cargado)
+        completados = self.admin_memoria.procesos_completados
+        if self.completados_mostrados[0] is not completados or self.completados_mostrados[1] > len(completados):
+            self.completados_listbox.delete(0, tk.END)
+            self.completados_mostrados = (completados, 0)
+        for proceso in completados[self.completados_mostrados[1]:]:
             self.completados_listbox.insert(tk.END, f"Proceso {proceso.id} ({proceso.tamano} KB, {proceso.tiempo_ejecucion}s)")
+        self.completados_mostrados = (completados, len(completados))
         
         # Actualizar estadísticas
         stats = self.admin_memoria.calcular_estadisticas()
@@ -646,79 +1001,75 @@ class SimuladorMemoriaGUI:
         self.cola_var.set(str(stats['procesos_espera']))
         self.completados_var.set(str(stats['procesos_finalizados']))
         
-        # Actualizar gráficos
-        self.actualizar_grafico_memoria()
+        # Planificación de CPU
+        metricas = self.admin_memoria.calcular_metricas_planificacion()
+        planificador = self.admin_memoria.planificador
+        resumen = (f"espera {metricas['espera_promedio']:.1f}s, retorno {metricas['retorno_promedio']:.1f}s, "
+                   f"respuesta {metricas['respuesta_promedio']:.1f}s (promedios)")
+        if planificador:
+            resumen = (f"{planificador} - {metricas['procesos_listos']} listos, "
+                       f"CPU {metricas['utilizacion_cpu']:.1f}% - " + resumen)
+        self.planificacion_var.set(resumen)
+        
         self.actualizar_grafico_estadisticas()
     
+    def inicios_particiones(self):
+        # Las posiciones solo cambian cuando se crea o se carga otra lista de particiones
+        particiones = self.admin_memoria.particiones
+        if self.inicios_cache[0] is not particiones:
+            self.inicios_cache = (particiones, calcular_inicios(particiones))
+        return self.inicios_cache[1]
+    
     def actualizar_grafico_memoria(self):
-        # Limpiar gráfico
-        self.ax.clear()
-        
-        # Configurar aspecto del gráfico
-        self.ax.set_ylim(0, 1)
-        self.ax.set_xlim(0, self.admin_memoria.memoria_total)
-        self.ax.set_title('Estado de la Memoria RAM')
-        self.ax.set_xlabel('Tamaño (KB)')
-        self.ax.get_yaxis().set_visible(False)
-        
-        # Variables para el seguimiento
-        pos_inicio = 0
-        altura_bloque = 0.6
-        y_pos = 0.2
-        
-        # Dibujar cada partición
-        for particion in self.admin_memoria.particiones:
-            # Rectángulo de la partición
-            rect = patches.Rectangle((pos_inicio, y_pos - altura_bloque/2), 
-                                    particion.tamano, altura_bloque,
-                                    linewidth=1, edgecolor='black', facecolor='lightgray')
-            self.ax.add_patch(rect)
-            
-            # Si hay un proceso en la partición
-            if not particion.esta_libre():
-                # Rectángulo del proceso
-                proc_rect = patches.Rectangle((pos_inicio, y_pos - altura_bloque/2), 
-                                             particion.proceso.tamano, altura_bloque,
-                                             linewidth=0, facecolor=particion.proceso.color)
-                self.ax.add_patch(proc_rect)
-                
-                # Etiqueta del proceso
-                self.ax.text(pos_inicio + particion.proceso.tamano/2, y_pos, 
-                            f"P{particion.proceso.id}\n{particion.proceso.tamano} KB",
-                            ha='center', va='center', color='white', 
-                            fontweight='bold', fontsize=10)
-                
-                # Mostrar fragmentación si existe
-                if particion.fragmentacion_interna > 0:
-                    # Línea punteada para separar proceso y fragmentación
-                    self.ax.plot([pos_inicio + particion.proceso.tamano, pos_inicio + particion.proceso.tamano],
-                                [y_pos - altura_bloque/2, y_pos + altura_bloque/2],
-                                'k--', linewidth=1)
-                    
-                    # Etiqueta de fragmentación
-                    self.ax.text(pos_inicio + particion.proceso.tamano + particion.fragmentacion_interna/2, y_pos,
-                                f"Frag.\n{particion.fragmentacion_interna} KB",
-                                ha='center', va='center', color='black', 
-                                fontsize=8)
-            else:
-                # Etiqueta para partición libre
-                self.ax.text(pos_inicio + particion.tamano/2, y_pos, 
-                            f"Libre\n{particion.tamano} KB",
-                            ha='center', va='center', color='black', 
-                            fontweight='bold', fontsize=10)
-            
-            # Etiqueta de la partición
-            self.ax.text(pos_inicio + particion.tamano/2, y_pos - altura_bloque/2 - 0.1,
-                        f"Partición {particion.id}",
-                        ha='center', va='center', color='black', fontsize=8)
-            
-            # Actualizar posición para la siguiente partición
-            pos_inicio += particion.tamano
+        dibujar_memoria(self.ax, self.admin_memoria.particiones, self.admin_memoria.memoria_total,
+                        vista=self.vista_memoria, inicios=self.inicios_particiones())
+        
+        # ax.clear() borra los callbacks del eje: volver a escuchar los cambios de vista
+        self.ax.callbacks.connect('xlim_changed', self.cambio_vista)
         
         # Actualizar el canvas
         self.canvas.draw()
     
-    def actualizar_grafico_estadisticas(self):
+    def cambio_vista(self, ax):
+        # Zoom o desplazamiento con la barra: refinar el nivel de detalle al terminar
+        if not self.refinado_pendiente and not self.arrastrando:
+            self.refinado_pendiente = True
+            self.root.after_idle(self.refinar_vista)
+    
+    def refinar_vista(self):
+        self.refinado_pendiente = False
+        # Desplazar la vista más allá de la memoria la recorta a lo que se puede dibujar
+        vista = ajustar_vista(self.ax.get_xlim(), self.admin_memoria.memoria_total)
+        if vista != self.vista_memoria:
+            self.vista_memoria = vista
+            self.actualizar_lista_particiones()
+            self.actualizar_grafico_memoria()
+    
+    def inicio_arrastre(self, event):
+        if event.inaxes is self.ax:
+            self.arrastrando = True
+    
+    def fin_arrastre(self, event):
+        if self.arrastrando:
+            self.arrastrando = False
+            self.cambio_vista(self.ax)
+    
+    def zoom_rueda(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        
+        x_min, x_max = self.ax.get_xlim()
+        factor = 0.8 if event.button == 'up' else 1.25
+        nuevo_min = max(event.xdata - (event.xdata - x_min) * factor, 0)
+        nuevo_max = min(event.xdata + (x_max - event.xdata) * factor, self.admin_memoria.memoria_total)
+        if nuevo_max - nuevo_min < 1:
+            return
+        
+        self.vista_memoria = (nuevo_min, nuevo_max)
+        self.actualizar_lista_particiones()
+        self.actualizar_grafico_memoria()
+    
+    def crear_barras_estadisticas(self, particiones):
         # Limpiar gráficos
         self.ax_uso.clear()
         self.ax_frag.clear()
@@ -727,44 +1078,95 @@ class SimuladorMemoriaGUI:
         self.ax_uso.set_title('Distribución de Memoria')
         self.ax_frag.set_title('Fragmentación Interna')
         
-        # Datos para gráficos
-        particiones = [f"P{p.id}" for p in self.admin_memoria.particiones]
-        tamanos = [p.tamano for p in self.admin_memoria.particiones]
-        
-        # Calcular uso real y fragmentación
-        uso_real = []
-        fragmentacion = []
-        colores = []
-        
-        for p in self.admin_memoria.particiones:
-            if p.esta_libre():
-                uso_real.append(0)
-                fragmentacion.append(0)
-                colores.append('lightgray')
-            else:
-                uso_real.append(p.proceso.tamano)
-                fragmentacion.append(p.fragmentacion_interna)
-                colores.append(p.proceso.color)
+        # Datos para gráficos: una barra por partición, o por grupo de particiones consecutivas
+        # si hay más de MAX_BARRAS_ESTADISTICAS
+        tam_grupo = max(-(-len(particiones) // MAX_BARRAS_ESTADISTICAS), 1)
+        tamanos = [p.tamano for p in particiones]
+        if tam_grupo == 1:
+            self.grupos_barras = None
+            nombres = [f"P{p.id}" for p in particiones]
+        else:
+            self.grupos_barras = np.arange(0, len(particiones), tam_grupo)
+            nombres = [f"P{particiones[i].id}" for i in self.grupos_barras]
+            tamanos = np.add.reduceat(tamanos, self.grupos_barras)
+        posiciones = range(len(nombres))
+        ceros = [0] * len(nombres)
         
-        # Gráfico de barras apiladas para uso de memoria
-        self.ax_uso.bar(particiones, tamanos, color='lightgray', label='Total')
-        self.ax_uso.bar(particiones, uso_real, color=colores, label='Usado')
+        # Gráfico de barras apiladas para uso de memoria; las barras de uso y de
+        # fragmentación se conservan y se actualizan en cada tick
+        barras_total = self.ax_uso.bar(posiciones, tamanos, color='lightgray', label='Total')
+        self.barras_uso = self.ax_uso.bar(posiciones, ceros, color='steelblue')
         
         # Gráfico de barras para fragmentación
-        self.ax_frag.bar(particiones, fragmentacion, color='orange', label='Fragmentación')
+        self.barras_frag = self.ax_frag.bar(posiciones, ceros, color='orange', label='Fragmentación')
         
-        # Configurar etiquetas y leyendas
-        self.ax_uso.set_xlabel('Particiones')
-        self.ax_uso.set_ylabel('Tamaño (KB)')
-        self.ax_uso.legend()
+        # Configurar etiquetas y leyendas; con grupos solo se rotulan algunas barras
+        etiqueta_x = 'Particiones' if tam_grupo == 1 else f'Particiones (grupos de {tam_grupo})'
+        for ax in (self.ax_uso, self.ax_frag):
+            if tam_grupo == 1:
+                ax.set_xticks(posiciones, nombres)
+            else:
+                ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+                ax.xaxis.set_major_formatter(FuncFormatter(
+                    lambda x, pos: nombres[int(x)] if 0 <= x < len(nombres) else ''))
+            ax.set_xlabel(etiqueta_x)
+            ax.set_ylabel('Tamaño (KB)')
+        
+        if tam_grupo == 1:
+            # Cada barra de uso toma el color de su proceso: la leyenda usa una muestra neutra
+            usado = patches.Patch(facecolor='white', edgecolor='black', label='Usado (color del proceso)')
+        else:
+            usado = patches.Patch(facecolor='steelblue', label='Usado')
+        self.ax_uso.legend(handles=[barras_total, usado])
         
-        self.ax_frag.set_xlabel('Particiones')
-        self.ax_frag.set_ylabel('Tamaño (KB)')
+        self.barras_particiones = particiones
+        self.fig_stats.tight_layout()
+    
+    def ajustar_layout_estadisticas(self, event=None):
+        # tight_layout es costoso: solo se recalcula al cambiar el tamaño de la ventana
+        if not self.layout_pendiente:
+            self.layout_pendiente = True
+            self.root.after_idle(self.aplicar_layout_estadisticas)
+    
+    def aplicar_layout_estadisticas(self):
+        self.layout_pendiente = False
+        self.fig_stats.tight_layout()
+        self.canvas_stats.draw_idle()
+    
+    def actualizar_grafico_estadisticas(self):
+        # Las barras se recrean solo cuando cambia el conjunto de particiones
+        particiones = self.admin_memoria.particiones
+        if self.barras_particiones is not particiones:
+            self.crear_barras_estadisticas(particiones)
+        
+        # Actualizar uso real y fragmentación en las barras existentes
+        frag_maxima = 0
+        if self.grupos_barras is None:
+            for p, barra_uso, barra_frag in zip(particiones, self.barras_uso, self.barras_frag):
+                if p.esta_libre():
+                    barra_uso.set_height(0)
+                    barra_uso.set_facecolor('lightgray')
+                    barra_frag.set_height(0)
+                else:
+                    barra_uso.set_height(p.proceso.tamano)
+                    barra_uso.set_facecolor(p.proceso.color)
+                    barra_frag.set_height(p.fragmentacion_interna)
+                    frag_maxima = max(frag_maxima, p.fragmentacion_interna)
+        else:
+            # Sumas por grupo: solo se tocan MAX_BARRAS_ESTADISTICAS barras
+            usados = np.add.reduceat([0 if p.esta_libre() else p.proceso.tamano for p in particiones],
+                                     self.grupos_barras)
+            frags = np.add.reduceat([0 if p.esta_libre() else p.fragmentacion_interna for p in particiones],
+                                    self.grupos_barras)
+            for barra_uso, barra_frag, usado, frag in zip(self.barras_uso, self.barras_frag, usados, frags):
+                barra_uso.set_height(usado)
+                barra_frag.set_height(frag)
+            frag_maxima = frags.max()
+        
+        self.ax_frag.set_ylim(0, frag_maxima * 1.05 if frag_maxima > 0 else 1)
         
         # Actualizar canvas
-        self.fig_stats.tight_layout()
-        self.canvas_stats.draw()
-
+        self.canvas_stats.draw_idle()
 
 if __name__ == "__main__":
     root = tk.Tk()
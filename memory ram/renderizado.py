@@ -0,0 +1,205 @@
+"""
+Renderizado sin interfaz gráfica de un diario de ejecución.
+
+Lee el diario JSONL que graba AdministradorMemoria (un cuadro por tick) y dibuja
+cada cuadro con la misma disposición que el mapa de memoria de la GUI, usando el
+backend Agg de matplotlib, sin Tk. Los cuadros se reparten entre un grupo de
+procesos y los cuadros consecutivos idénticos se dibujan una sola vez.
+
+Uso:
+    python renderizado.py diario_memoria.jsonl cuadros/              # PNG por tick
+    python renderizado.py diario_memoria.jsonl cuadros/ --formato svg
+    python renderizado.py diario_memoria.jsonl memoria.gif --fps 10  # requiere ffmpeg
+    python renderizado.py diario_memoria.jsonl memoria.mp4 --fps 30  # requiere ffmpeg
+"""
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from memoria import dibujar_memoria, particiones_desde_cuadro
+
+FORMATOS_ANIMACION = ('.gif', '.mp4', '.webm', '.mkv', '.avi', '.mov')
+
+# Cuadros únicos enviados al grupo de procesos en cada lote
+TAMANO_LOTE = 256
+
+# Figura reutilizada por cada proceso trabajador
+_figura = None
+_ax = None
+
+
+def _iniciar_trabajador(tamano_figura, dpi):
+    global _figura, _ax
+    _figura = Figure(figsize=tamano_figura, dpi=dpi)
+    FigureCanvasAgg(_figura)
+    _ax = _figura.add_subplot(111)
+
+
+def _renderizar_cuadro(tarea):
+    cuadro, ruta = tarea
+    dibujar_memoria(_ax, particiones_desde_cuadro(cuadro), cuadro["memoria_total"])
+    _figura.savefig(ruta)
+    return ruta
+
+
+def leer_cuadros_unicos(ruta_diario):
+    # Agrupa los cuadros consecutivos idénticos: genera (cuadro, repeticiones)
+    anterior = None
+    clave_anterior = None
+    repeticiones = 0
+    with open(ruta_diario, 'r') as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            cuadro = json.loads(linea)
+            clave = (cuadro["memoria_total"], cuadro["particiones"])
+            if clave == clave_anterior:
+                repeticiones += 1
+                continue
+            if anterior is not None:
+                yield anterior, repeticiones
+            anterior = cuadro
+            clave_anterior = clave
+            repeticiones = 1
+    if anterior is not None:
+        yield anterior, repeticiones
+
+
+def _lotes(iterable, tamano):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _enlazar(origen, destino):
+    # Reutiliza el archivo ya dibujado para un cuadro repetido
+    if os.path.exists(destino):
+        os.remove(destino)
+    try:
+        os.link(origen, destino)
+    except OSError:
+        shutil.copyfile(origen, destino)
+
+
+def _lista_concat(secuencia, fps, directorio):
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("Se necesita ffmpeg en el PATH para exportar animaciones")
+    
+    # Lista para el demuxer concat: cada cuadro único dura lo que sus repeticiones
+    lista = os.path.join(directorio, "cuadros.txt")
+    with open(lista, 'w') as f:
+        f.write("ffconcat version 1.0\n")
+        for ruta, repeticiones in secuencia:
+            f.write(f"file '{os.path.abspath(ruta)}'\n")
+            f.write(f"duration {repeticiones / fps:.6f}\n")
+        # El demuxer ignora la duración del último archivo si no se repite
+        f.write(f"file '{os.path.abspath(secuencia[-1][0])}'\n")
+    return lista
+
+
+def _crear_gif(secuencia, destino, fps, directorio):
+    # Dos pasadas sobre los cuadros: primero la paleta y luego el GIF con esa paleta,
+    # de modo que ffmpeg no necesita retener los cuadros entre una y otra
+    lista = _lista_concat(secuencia, fps, directorio)
+    paleta = os.path.join(directorio, "paleta.png")
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error",
+                    "-f", "concat", "-safe", "0", "-i", lista,
+                    "-vf", "palettegen", paleta], check=True)
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error",
+                    "-f", "concat", "-safe", "0", "-i", lista, "-i", paleta,
+                    "-lavfi", f"fps={fps}[cuadros];[cuadros][1:v]paletteuse",
+                    "-loop", "0", destino], check=True)
+
+
+def _crear_video(secuencia, destino, fps, directorio):
+    lista = _lista_concat(secuencia, fps, directorio)
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error",
+                    "-f", "concat", "-safe", "0", "-i", lista,
+                    "-vf", f"fps={fps},scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p",
+                    destino], check=True)
+
+
+def renderizar(ruta_diario, destino, formato="png", fps=10, procesos=None,
+               tamano_figura=(6, 5), dpi=100):
+    # Renderiza el diario en un directorio de cuadros (PNG o SVG, uno por tick) o en una
+    # animación si el destino termina en .gif, .mp4, .webm, .mkv, .avi o .mov.
+    # Devuelve (ticks, cuadros_unicos).
+    animacion = os.path.splitext(destino)[1].lower() in FORMATOS_ANIMACION
+    if animacion:
+        directorio = tempfile.mkdtemp(prefix="cuadros_memoria_")
+        formato = "png"
+    else:
+        directorio = destino
+        os.makedirs(directorio, exist_ok=True)
+    
+    secuencia = []  # (archivo dibujado, repeticiones)
+    ticks = 0
+    try:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(tamano_figura, dpi)) as grupo:
+            for lote in _lotes(leer_cuadros_unicos(ruta_diario), TAMANO_LOTE):
+                tareas = []
+                for cuadro, repeticiones in lote:
+                    ruta = os.path.join(directorio, f"cuadro_{ticks:06d}.{formato}")
+                    tareas.append((cuadro, ruta))
+                    secuencia.append((ruta, repeticiones))
+                    ticks += repeticiones
+                
+                for _ in grupo.map(_renderizar_cuadro, tareas, chunksize=8):
+                    pass
+        
+        if not secuencia:
+            raise ValueError(f"El diario {ruta_diario} no contiene cuadros")
+        
+        if animacion:
+            if destino.lower().endswith(".gif"):
+                _crear_gif(secuencia, destino, fps, directorio)
+            else:
+                _crear_video(secuencia, destino, fps, directorio)
+        else:
+            # Un archivo por tick: los repetidos se enlazan al cuadro ya dibujado
+            indice = 0
+            for ruta, repeticiones in secuencia:
+                for i in range(indice + 1, indice + repeticiones):
+                    _enlazar(ruta, os.path.join(directorio, f"cuadro_{i:06d}.{formato}"))
+                indice += repeticiones
+    finally:
+        if animacion:
+            shutil.rmtree(directorio, ignore_errors=True)
+    
+    return ticks, len(secuencia)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderiza un diario de ejecución sin interfaz gráfica.")
+    parser.add_argument("diario", help="Diario JSONL grabado por el simulador")
+    parser.add_argument("destino", help="Directorio de cuadros o archivo .gif/.mp4/.webm/.mkv/.avi/.mov")
+    parser.add_argument("--formato", choices=("png", "svg"), default="png",
+                        help="Formato de los cuadros cuando el destino es un directorio")
+    parser.add_argument("--fps", type=float, default=10, help="Ticks por segundo en la animación")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de renderizado (por defecto, uno por CPU)")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+    
+    ticks, unicos = renderizar(args.diario, args.destino, formato=args.formato, fps=args.fps,
+                               procesos=args.procesos, dpi=args.dpi)
+    print(f"{ticks} ticks renderizados ({unicos} cuadros únicos) en {args.destino}")
+
+
+if __name__ == "__main__":
+    main()